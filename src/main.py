@@ -9,6 +9,7 @@ from collections import deque
 from datetime import datetime
 from preprocess import ChanelProcessor
 import threading
+import sys
 
 # UI Configuration Constants
 BACKGROUND_COLOR = "#111827"
@@ -21,10 +22,6 @@ ROW_ALIGNMENT = ft.MainAxisAlignment.SPACE_BETWEEN
 osc_servers = {}
 
 # Chart Configuration Variables
-eeg_charts = []
-channel_charts = []
-metrics_charts = []  # Nuevo arreglo para métricas
-active_charts = []
 eeg_data_series = {}
 max_points = 100
 channel_data_series = [deque(maxlen=max_points) for _ in range(5)]
@@ -44,6 +41,109 @@ buffered_channel_data = [[] for _ in range(5)]
 buffered_metrics_data = [[] for _ in range(5)]  # Buffer para métricas
 update_interval_seconds = 2.0
 
+# Multi-viewer broadcast state
+WEB_PORT = 8550
+viewers = {}
+viewers_lock = threading.Lock()
+latest_frame = {"eeg": (0, None), "channels": (0, None), "metrics": (0, None)}
+chart_updates_started = False
+
+
+class Viewer:
+    """
+    Chart controls and view selection for one connected page.
+
+    Flet controls belong to a single page, so every viewer owns its charts.
+    The chart frames themselves are computed once per tick and shared.
+
+    Each viewer has its own send thread and a one-slot mailbox holding the
+    latest frame. A slow page only delays itself: frames posted while a send
+    is in flight replace each other, and the page resumes with the newest
+    frame once its previous update completes. The send thread is the only
+    place that renders charts and updates the page.
+
+    Attributes:
+        page (ft.Page): The page this viewer renders to
+        eeg_charts (list): One chart per EEG channel
+        channel_charts (list): Single chart with the five frequency bands
+        metrics_charts (list): Single chart with the five metrics
+        view (str): Selected view, one of 'eeg', 'channels' or 'metrics'
+        sent_versions (dict): Frame version last rendered for each view
+        pending_frame (dict): Latest frame not yet sent, None if up to date
+        skipped_frames (int): Frames replaced while a send was in flight, logged on the next send
+        sending (bool): True while the send thread is updating the page
+        closed (bool): True once the page has gone away
+    """
+
+    def __init__(self, page):
+        """Creates the per-page charts for a new viewer.
+
+        Args:
+            page (ft.Page): The page this viewer renders to
+        """
+        self.page = page
+        self.eeg_charts = [generate_plot() for _ in range(len(eeg_channels))]
+        self.channel_charts = [generate_plot(height=600)]
+        self.metrics_charts = [generate_plot(height=600)]  # Gráfica vacía por defecto
+        self.view = "eeg"
+        self.sent_versions = {}
+        self.pending_frame = None
+        self.skipped_frames = 0
+        self.sending = False
+        self.closed = False
+        self.mailbox_lock = threading.Lock()
+        self.frame_ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Starts the send thread for this viewer if it is not running yet."""
+        if self.thread is None:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def post(self, frame):
+        """Puts a frame in the mailbox, replacing any frame not yet sent.
+
+        Args:
+            frame (dict): Maps each view to its (version, payload) frame
+        """
+        with self.mailbox_lock:
+            if self.pending_frame is not None and self.sending:
+                self.skipped_frames += 1
+            self.pending_frame = frame
+        self.frame_ready.set()
+
+    def close(self):
+        """Stops the send thread."""
+        self.closed = True
+        self.frame_ready.set()
+
+    def run(self):
+        """Sends the latest frame whenever one is posted until the viewer is closed."""
+        while True:
+            self.frame_ready.wait()
+            if self.closed:
+                return
+            with self.mailbox_lock:
+                frame, self.pending_frame = self.pending_frame, None
+                skipped, self.skipped_frames = self.skipped_frames, 0
+                self.frame_ready.clear()
+            if frame is None:
+                continue
+            if skipped:
+                print(f"Viewer {self.page.session_id} fell behind, skipped {skipped} frames")
+            self.sending = True
+            try:
+                if render_view(self, frame):
+                    self.page.update()
+            except Exception as e:
+                print(f"Dropping viewer after send error: {e}")
+                close_viewer(self)
+                return
+            finally:
+                self.sending = False
+
+
 def buffer_eeg_data(timestamp, values):
     for i, value in enumerate(values):
         if i not in buffered_eeg_data:
@@ -58,114 +158,143 @@ def buffer_metrics_data(timestamp, values):
     for i in range(min(len(values), 5)):
         buffered_metrics_data[i].append((timestamp, values[i]))
 
-def update_charts_periodically():
+def drain_points(points, series):
+    for point in points:
+        dt = datetime.fromisoformat(point[0])
+        label = dt.strftime("%H:%M:%S")
+        series.append((label, point[1]))
+
+def series_points(series):
+    return tuple((j, p[1]) for j, p in enumerate(series))
+
+def series_labels(series):
+    return tuple((j, p[0]) for j, p in enumerate(series) if j % (max_points // 10) == 0)
+
+def compute_frame():
+    """Moves buffered samples into the chart series and rebuilds changed frames.
+
+    Each frame is a (version, payload) pair computed once per tick and shared by
+    every viewer. Payloads hold plain (x, y) points and (x, label) axis labels.
+    """
     # EEG Charts
-    for i in range(len(eeg_charts)):
-        if i in buffered_eeg_data:
-            new_points = buffered_eeg_data[i]
-            for point in new_points:
-                dt = datetime.fromisoformat(point[0])
-                label = dt.strftime("%H:%M:%S")
-                eeg_data_series.setdefault(i, deque(maxlen=max_points)).append((label, point[1]))
-            buffered_eeg_data[i] = []
+    eeg_updated = False
+    for i in list(buffered_eeg_data):
+        new_points, buffered_eeg_data[i] = buffered_eeg_data[i], []
+        if new_points:
+            drain_points(new_points, eeg_data_series.setdefault(i, deque(maxlen=max_points)))
+            eeg_updated = True
+
+    if eeg_updated:
+        version, _ = latest_frame["eeg"]
+        latest_frame["eeg"] = (version + 1, tuple(
+            (series_points(eeg_data_series.get(i, ())), series_labels(eeg_data_series.get(i, ())))
+            for i in range(len(eeg_channels))
+        ))
+
+    # Channel and Metrics Charts
+    for view, buffered, series in (
+        ("channels", buffered_channel_data, channel_data_series),
+        ("metrics", buffered_metrics_data, metrics_data_series),
+    ):
+        updated = False
+        for i in range(5):
+            new_points, buffered[i] = buffered[i], []
+            if new_points:
+                drain_points(new_points, series[i])
+                updated = True
+
+        if updated:
+            version, _ = latest_frame[view]
+            latest_frame[view] = (version + 1, (
+                tuple(series_points(series[i]) for i in range(5)),
+                series_labels(series[0]),
+            ))
+
+def render_chart(chart, series, labels, colors):
+    chart.data_series = [
+        ft.LineChartData(
+            data_points=[ft.LineChartDataPoint(x, y) for x, y in points],
+            stroke_width=2,
+            color=colors[i],
+            curved=True,
+            stroke_cap_round=True,
+        )
+        for i, points in enumerate(series)
+    ]
+    chart.bottom_axis.labels = [
+        ft.ChartAxisLabel(
+            x,
+            ft.Text(value=label, size=10, color=ft.Colors.WHITE)
+        )
+        for x, label in labels
+    ]
+
+def render_view(viewer, frame):
+    """Applies the shared frame for the viewer's selected view to its charts.
+
+    Args:
+        viewer (Viewer): The viewer to render
+        frame (dict): Maps each view to its (version, payload) frame
+
+    Returns:
+        bool: True if any chart changed
+    """
+    view = viewer.view
+    version, payload = frame[view]
+    if payload is None or viewer.sent_versions.get(view) == version:
+        return False
 
-            chart = eeg_charts[i]
-            if is_chart_ready(chart):
-                chart.data_series = [
-                    ft.LineChartData(
-                        data_points=[
-                            ft.LineChartDataPoint(j, p[1])
-                            for j, p in enumerate(eeg_data_series[i])
-                        ],
-                        stroke_width=2,
-                        color=chart_colors[i],
-                        curved=True,
-                        stroke_cap_round=True,
-                    )
-                ]
-                chart.bottom_axis.labels = [
-                    ft.ChartAxisLabel(
-                        j,
-                        ft.Text(value=p[0], size=10, color=ft.Colors.WHITE)
-                    )
-                    for j, p in enumerate(eeg_data_series[i]) if j % (max_points // 10) == 0
-                ]
-                chart.update()
-
-    # Channel Charts
-    updated = False
-    for i in range(5):
-        if buffered_channel_data[i]:
-            for point in buffered_channel_data[i]:
-                dt = datetime.fromisoformat(point[0])
-                label = dt.strftime("%H:%M:%S")
-                channel_data_series[i].append((label, point[1]))
-            buffered_channel_data[i] = []
-            updated = True
-
-    if updated and channel_charts:
-        chart = channel_charts[0]
-        if is_chart_ready(chart):
-            chart.data_series = [
-                ft.LineChartData(
-                    data_points=[
-                        ft.LineChartDataPoint(j, p[1])
-                        for j, p in enumerate(channel_data_series[i])
-                    ],
-                    stroke_width=2,
-                    color=chart_colors[i],
-                    curved=True,
-                    stroke_cap_round=True,
-                )
-                for i in range(5)
-            ]
-            chart.bottom_axis.labels = [
-                ft.ChartAxisLabel(
-                    j,
-                    ft.Text(value=p[0], size=10, color=ft.Colors.WHITE)
-                )
-                for j, p in enumerate(channel_data_series[0]) if j % (max_points // 10) == 0
-            ]
-            chart.update()
-
-    # Metrics Charts
-    metrics_updated = False
-    for i in range(5):
-        if buffered_metrics_data[i]:
-            for point in buffered_metrics_data[i]:
-                dt = datetime.fromisoformat(point[0])
-                label = dt.strftime("%H:%M:%S")
-                metrics_data_series[i].append((label, point[1]))
-            buffered_metrics_data[i] = []
-            metrics_updated = True
-
-    if metrics_updated and metrics_charts:
-        chart = metrics_charts[0]
-        if is_chart_ready(chart):
-            chart.data_series = [
-                ft.LineChartData(
-                    data_points=[
-                        ft.LineChartDataPoint(j, p[1])
-                        for j, p in enumerate(metrics_data_series[i])
-                    ],
-                    stroke_width=2,
-                    color=chart_colors[i],
-                    curved=True,
-                    stroke_cap_round=True,
-                )
-                for i in range(5)
-            ]
-            chart.bottom_axis.labels = [
-                ft.ChartAxisLabel(
-                    j,
-                    ft.Text(value=p[0], size=10, color=ft.Colors.WHITE)
-                )
-                for j, p in enumerate(metrics_data_series[0]) if j % (max_points // 10) == 0
-            ]
-            chart.update()
+    # Only properties are set here; the caller sends them with a single page.update()
+    if view == "eeg":
+        for i, chart in enumerate(viewer.eeg_charts):
+            points, labels = payload[i]
+            render_chart(chart, [points], labels, [chart_colors[i]])
+    else:
+        chart = viewer.channel_charts[0] if view == "channels" else viewer.metrics_charts[0]
+        series, labels = payload
+        render_chart(chart, series, labels, chart_colors)
+
+    viewer.sent_versions[view] = version
+    return True
+
+def broadcast_frame(frame):
+    """Posts the shared frame to every viewer's mailbox without waiting on any send."""
+    with viewers_lock:
+        current = list(viewers.values())
+    for viewer in current:
+        viewer.post(frame)
+
+def register_viewer(viewer):
+    """Adds a connected viewer to the broadcast and sends it the latest frame."""
+    with viewers_lock:
+        viewers[viewer.page.session_id] = viewer
+    viewer.start()
+    viewer.post(dict(latest_frame))
+
+def unregister_viewer(viewer):
+    """Removes a viewer from the broadcast; its send thread idles until it reconnects."""
+    with viewers_lock:
+        if viewers.get(viewer.page.session_id) is viewer:
+            del viewers[viewer.page.session_id]
+
+def close_viewer(viewer):
+    """Removes a viewer for good and stops its send thread."""
+    unregister_viewer(viewer)
+    viewer.close()
 
+def update_charts_periodically():
+    compute_frame()
+    broadcast_frame(dict(latest_frame))
     threading.Timer(update_interval_seconds, update_charts_periodically).start()
 
+def start_chart_updates():
+    global chart_updates_started
+    with viewers_lock:
+        if chart_updates_started:
+            return
+        chart_updates_started = True
+    update_charts_periodically()
+
 def get_local_ip():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
@@ -175,12 +304,6 @@ def get_local_ip():
         s.close()
     return ip
 
-def is_chart_ready(chart):
-    try:
-        return chart.page is not None
-    except:
-        return False
-
 def osc_handler(address, *args):
     global chart_number
     timestamp = datetime.now().isoformat()
@@ -198,7 +321,7 @@ def osc_handler(address, *args):
         if data:
             chart_number = 1
             y_values = [float(value) for value in data[:5]]
-            metrics_results = metricsCalculator.process(timestamp, *y_values)
+            metrics_results = metricsCalculator.process(timestamp, **dict(zip(absolute_channels, y_values)))
             if metrics_results is not None:
                 buffer_metrics_data(timestamp, metrics_results)  # Guardar métricas en buffer
             buffer_channel_data(timestamp, y_values)
@@ -225,13 +348,13 @@ def main(page: ft.Page):
     page.scroll = ft.ScrollMode.AUTO
     page.padding = CARD_PADDING
 
-    global chart_column, active_charts, eeg_charts, channel_charts, metrics_charts
+    viewer = Viewer(page)
 
     ip_text = ft.Text(f"{get_local_ip()}", size=14, color="#7e8bc0", weight="bold")
 
     common_ports = ft.Dropdown(width=160, options=[ft.dropdown.Option(str(p)) for p in [3333, 8338, 8000, 9000]], value="3333", bgcolor=ft.Colors.BLUE_GREY_800, color=ft.Colors.WHITE)
 
-    listening_ports = ft.Dropdown(width=160, hint_text="Now Listening...", bgcolor=ft.Colors.BLUE_GREY_800, color=ft.Colors.WHITE)
+    listening_ports = ft.Dropdown(width=160, hint_text="Now Listening...", options=[ft.dropdown.Option(str(p)) for p in osc_servers], bgcolor=ft.Colors.BLUE_GREY_800, color=ft.Colors.WHITE)
 
     def add_port_click(e):
         port = int(common_ports.value)
@@ -254,19 +377,8 @@ def main(page: ft.Page):
             page.snack_bar.open = True
             page.update()
 
-    eeg_charts.clear()
-    channel_charts.clear()
-    metrics_charts.clear()
-
-    for i in range(6):
-        eeg_charts.append(generate_plot())
-    channel_charts = [generate_plot(height=600)]
-    metrics_charts = [generate_plot(height=600)]  # Gráfica vacía por defecto
-
-    active_charts = eeg_charts
-
     chart_column = ft.Column()
-    for i, ch in enumerate(eeg_charts):
+    for i, ch in enumerate(viewer.eeg_charts):
         chart_column.controls.append(
             ft.Row(
                 controls=[ch, ft.Text(eeg_channels[i], color=chart_colors[i])],
@@ -275,10 +387,9 @@ def main(page: ft.Page):
         )
 
     def show_eeg_charts(e):
-        global active_charts
-        active_charts = eeg_charts
+        viewer.view = "eeg"
         chart_column.controls.clear()
-        for i, ch in enumerate(eeg_charts):
+        for i, ch in enumerate(viewer.eeg_charts):
             chart_column.controls.append(
                 ft.Row(
                     controls=[ch, ft.Text(eeg_channels[i], color=chart_colors[i])],
@@ -286,14 +397,14 @@ def main(page: ft.Page):
                 )
             )
         page.update()
+        viewer.post(dict(latest_frame))
 
     def show_channel_charts(e):
-        global active_charts
-        active_charts = channel_charts
+        viewer.view = "channels"
         chart_column.controls.clear()
         chart_column.controls.append(
             ft.Column([
-                channel_charts[0],
+                viewer.channel_charts[0],
                 ft.Row([
                     ft.Text(ch, color=chart_colors[i])
                     for i, ch in enumerate(absolute_channels)
@@ -301,14 +412,14 @@ def main(page: ft.Page):
             ])
         )
         page.update()
+        viewer.post(dict(latest_frame))
 
     def show_metrics_charts(e):
-        global active_charts
-        active_charts = metrics_charts
+        viewer.view = "metrics"
         chart_column.controls.clear()
         chart_column.controls.append(
             ft.Column([
-                metrics_charts[0],
+                viewer.metrics_charts[0],
                 ft.Row([
                     ft.Text(f"Metric {i+1}", color=chart_colors[i])
                     for i in range(5)
@@ -316,6 +427,7 @@ def main(page: ft.Page):
             ])
         )
         page.update()
+        viewer.post(dict(latest_frame))
 
     eeg_button = ft.ElevatedButton("EEG", on_click=show_eeg_charts)
     channel_button = ft.ElevatedButton("CHANNELS", on_click=show_channel_charts)
@@ -368,8 +480,18 @@ def main(page: ft.Page):
         ], spacing=20)
     )
 
-    # Iniciar actualización de gráficos
-    update_charts_periodically()
+    # Registrar el visor y mostrar el último frame compartido
+    # Closed or refreshed tabs only disconnect; the session expires later
+    page.on_disconnect = lambda e: unregister_viewer(viewer)
+    page.on_connect = lambda e: register_viewer(viewer)
+    page.on_close = lambda e: close_viewer(viewer)
+    register_viewer(viewer)
+
+    # Iniciar actualización de gráficos (una sola vez para todos los visores)
+    start_chart_updates()
 
 if __name__ == "__main__":
-    ft.app(target=main, view=ft.AppView.FLET_APP)
\ No newline at end of file
+    if "--web" in sys.argv:
+        ft.app(target=main, view=ft.AppView.WEB_BROWSER, port=WEB_PORT)
+    else:
+        ft.app(target=main, view=ft.AppView.FLET_APP)
@@ -1,6 +1,10 @@
 from collections import deque
 from datetime import datetime
-from processor import BufferedFileWriter
+from processor import BufferedFileWriter, LOG_DIRECTORY
+from stats import StreamStats
+import atexit
+import json
+import os
 import threading
 import time
 
@@ -8,7 +12,10 @@ class MetricsCalculator:
     """A class for calculating metrics over a sliding time window.
     
     This class maintains a window of recent data points and computes various metrics
-    based on the data within the specified time window.
+    based on the data within the specified time window. Alongside the window it keeps
+    constant-memory session statistics (variance and quantiles) for every band and
+    ratio metric, which are written to ``logs/session_<timestamp>.json``. Each metrics
+row also carries the ratios z-scored against the session so far (``<ratio>_z``).
     """
     
     def __init__(self, window_seconds=10):
@@ -21,9 +28,19 @@ class MetricsCalculator:
         self.data_window = deque()
         self.last_calculation_time = None
         self.window_seconds = window_seconds
-        self.metrics = ['bar', 'hai', 'tar', 'tbr', 'wi', 'absolute_alpha', 'absolute_beta', 'absolute_gamma', 'absolute_theta', 'absolute_delta']
+        self.bands = ['alpha', 'beta', 'gamma', 'theta', 'delta']
+        self.ratios = ['bar', 'hai', 'tar', 'tbr', 'wi']
+        self.metrics = [*self.ratios, *(f"absolute_{band}" for band in self.bands), *(f"{ratio}_z" for ratio in self.ratios)]
+        self.band_stats = {band: StreamStats() for band in self.bands}
+        self.metric_stats = {metric: StreamStats() for metric in self.ratios}
+        self.stats_lock = threading.Lock()
+        self.summary_lock = threading.Lock()
+        self.session_start = datetime.now()
+        self.summary_file = f"{LOG_DIRECTORY}/session_{self.session_start.strftime('%Y%m%d_%H%M%S')}.json"
         self.writer = BufferedFileWriter("metrics", header=self.metrics)
+        self.save_summary()  # Marks the session start for SessionReader
         self.start_flush_threads()
+        atexit.register(self.save_summary)
 
     def start_flush_threads(self):
         """Starts a thread to periodically flush the buffered data to disk."""
@@ -31,8 +48,56 @@ class MetricsCalculator:
             while True:
                 time.sleep(interval)
                 writer.flush()
+                self.save_summary()
         threading.Thread(target=flush_periodically, args=(self.writer,), daemon=True).start()
 
+    def summary(self):
+        """Returns the session statistics for every band and ratio metric.
+
+        Returns:
+            dict: Session start time plus one StreamStats summary per band and metric
+        """
+        # Copy under the lock and sort afterwards so process() is not blocked
+        with self.stats_lock:
+            bands = {band: stats.copy() for band, stats in self.band_stats.items()}
+            metrics = {metric: stats.copy() for metric, stats in self.metric_stats.items()}
+        return {
+            "session_start": self.session_start.isoformat(),
+            "bands": {band: stats.summary() for band, stats in bands.items()},
+            "metrics": {metric: stats.summary() for metric, stats in metrics.items()},
+        }
+
+    def save_summary(self):
+        """Writes the current session statistics to the session summary file.
+
+        The summary is written to a temporary file and moved into place, so
+        readers never see a partially written file.
+        """
+        tmp_file = f"{self.summary_file}.tmp"
+        try:
+            with self.summary_lock:
+                with open(tmp_file, 'w') as f:
+                    json.dump(self.summary(), f, indent=2)
+                os.replace(tmp_file, self.summary_file)
+        except Exception as e:
+            print(f"Error writing session summary: {e}")
+
+    def zscore(self, name, value):
+        """Standardizes a band or metric value against the session so far.
+
+        Args:
+            name (str): A band ('alpha', ...) or ratio metric ('bar', ...) name
+            value (float): The value to standardize
+
+        Returns:
+            float or None: The z-score, or None if it is not defined yet
+        """
+        stats = self.band_stats.get(name) or self.metric_stats.get(name)
+        if stats is None or value is None:
+            return None
+        with self.stats_lock:
+            return stats.zscore(value)
+
     def process(self, timestamp: str, alpha: float, beta: float, gamma: float, theta: float, delta: float):
         """Process a new data point and calculate metrics if needed.
         
@@ -61,6 +126,9 @@ class MetricsCalculator:
         """
         now = datetime.fromisoformat(timestamp)
         self.data_window.append((now, alpha, beta, gamma, theta, delta))
+        with self.stats_lock:
+            for band, value in zip(self.bands, (alpha, beta, gamma, theta, delta)):
+                self.band_stats[band].update(value)
 
         # Remove data outside the time window
         while self.data_window and (now - self.data_window[0][0]).total_seconds() > self.window_seconds:
@@ -88,8 +156,16 @@ class MetricsCalculator:
                 tbr = mean_theta / mean_beta if mean_beta != 0 else None
                 wi = (mean_delta + mean_theta) / mean_alpha if mean_alpha != 0 else None
 
+                # Z-score each ratio against the session baseline before adding it
+                with self.stats_lock:
+                    zscores = []
+                    for metric, value in zip(self.ratios, (bar, hai, tar, tbr, wi)):
+                        stats = self.metric_stats[metric]
+                        zscores.append(stats.zscore(value) if value is not None else None)
+                        stats.update(value)
+
                 # Save to file
-                msg = f"{now},{bar},{hai},{tar},{tbr},{wi},{mean_alpha},{mean_beta},{mean_gamma},{mean_theta},{mean_delta}\n"
+                msg = f"{now},{bar},{hai},{tar},{tbr},{wi},{mean_alpha},{mean_beta},{mean_gamma},{mean_theta},{mean_delta},{','.join(str(z) for z in zscores)}\n"
                 self.writer.write(msg)
                 
                 self.last_calculation_time = now
@@ -0,0 +1,184 @@
+import csv
+import heapq
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+
+from processor import LOG_DIRECTORY
+
+SEGMENT_PATTERN = re.compile(r"^(?P<prefix>.+)_(?P<timestamp>\d{8}_\d{6})\.csv$")
+SESSION_PATTERN = re.compile(r"^session_(?P<timestamp>\d{8}_\d{6})\.json$")
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def list_segments(directory=LOG_DIRECTORY):
+    """Finds every CSV segment written by BufferedFileWriter.
+
+    Args:
+        directory (str, optional): Directory holding the log files
+
+    Returns:
+        dict: Maps each file prefix to a list of (start datetime, path) sorted by time
+    """
+    segments = {}
+    if not os.path.isdir(directory):
+        return segments
+    for name in os.listdir(directory):
+        match = SEGMENT_PATTERN.match(name)
+        if not match:
+            continue
+        started = datetime.strptime(match.group("timestamp"), TIMESTAMP_FORMAT)
+        segments.setdefault(match.group("prefix"), []).append((started, os.path.join(directory, name)))
+    for prefix in segments:
+        segments[prefix].sort()
+    return segments
+
+
+def list_sessions(directory=LOG_DIRECTORY):
+    """Finds the start time of every recorded session.
+
+    Sessions are identified by the ``session_<timestamp>.json`` summary that
+    MetricsCalculator writes for each run.
+
+    Args:
+        directory (str, optional): Directory holding the log files
+
+    Returns:
+        list: Session start datetimes sorted from oldest to newest
+    """
+    if not os.path.isdir(directory):
+        return []
+    sessions = []
+    for name in os.listdir(directory):
+        match = SESSION_PATTERN.match(name)
+        if match:
+            sessions.append(datetime.strptime(match.group("timestamp"), TIMESTAMP_FORMAT))
+    return sorted(sessions)
+
+
+def parse_float(value):
+    """Converts a CSV field to float, mapping empty or 'None' fields to NaN."""
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+class SessionReader:
+    """
+    Lazily reads one session across rotated segments and multiple streams.
+
+    All segments of the session are merged by timestamp with a streaming k-way
+    merge, so only one row per segment is held in memory at a time. Rows are
+    yielded as fixed-size NumPy chunks of shape (chunk_size, 1 + len(columns)):
+    column 0 is the POSIX timestamp and the remaining columns are the stream
+    values, with NaN where a row's stream does not provide that column. The last
+    chunk may be shorter. Each segment is expected to be written in time order.
+
+    Usage:
+    1. Create instance: reader = SessionReader()  # latest session, all streams
+    2. Inspect reader.columns, e.g. ['metrics.bar', 'metrics.hai', ...]
+    3. Iterate: for chunk in reader: ...
+
+    Attributes:
+        session_start (datetime): Start of the session being read, None if no sessions were recorded
+        segments (dict): Maps each stream prefix to its segment paths in time order
+        columns (list): Value column names as '<prefix>.<column>'
+        chunk_size (int): Number of rows per yielded chunk
+    """
+
+    def __init__(self, session_start=None, prefixes=None, chunk_size=DEFAULT_CHUNK_SIZE, directory=LOG_DIRECTORY):
+        """Finds the segments that belong to a session.
+
+        Args:
+            session_start (datetime, optional): Start of the session, as returned by
+                list_sessions(). Defaults to the latest session. If no sessions were
+                recorded, every segment is treated as part of a single session.
+            prefixes (list, optional): Streams to read. Defaults to all streams found.
+            chunk_size (int, optional): Rows per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+            directory (str, optional): Directory holding the log files
+
+        Raises:
+            ValueError: If chunk_size is smaller than 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        sessions = list_sessions(directory)
+        if session_start is None and sessions:
+            session_start = sessions[-1]
+        later = [s for s in sessions if session_start is not None and s > session_start]
+        session_end = later[0] if later else None
+
+        self.session_start = session_start
+        self.chunk_size = chunk_size
+        self.segments = {}
+        for prefix, found in list_segments(directory).items():
+            if prefixes is not None and prefix not in prefixes:
+                continue
+            paths = [
+                path for started, path in found
+                if (session_start is None or started >= session_start)
+                and (session_end is None or started < session_end)
+            ]
+            if paths:
+                self.segments[prefix] = paths
+
+        self.columns = []
+        self.offsets = {}
+        self.stream_columns = {}
+        for prefix in sorted(self.segments):
+            header = self.read_header(self.segments[prefix][0])
+            self.offsets[prefix] = 1 + len(self.columns)
+            self.stream_columns[prefix] = header
+            self.columns.extend(f"{prefix}.{column}" for column in header)
+
+    @staticmethod
+    def read_header(path):
+        """Returns the value column names of a segment, without the timestamp."""
+        with open(path, newline='') as f:
+            header = next(csv.reader(f), [])
+        return header[1:]
+
+    def read_stream(self, prefix):
+        """Yields (timestamp, prefix, values) for every row of one stream in order.
+
+        Args:
+            prefix (str): The stream to read
+
+        Yields:
+            tuple: POSIX timestamp, stream prefix and list of float values
+        """
+        columns = self.stream_columns[prefix]
+        for path in self.segments[prefix]:
+            with open(path, newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])[1:]
+                indices = [header.index(c) + 1 if c in header else None for c in columns]
+                for row in reader:
+                    try:
+                        timestamp = datetime.fromisoformat(row[0]).timestamp()
+                    except (ValueError, IndexError):
+                        continue  # Partially written or malformed row
+                    values = [parse_float(row[i]) if i is not None and i < len(row) else np.nan for i in indices]
+                    yield timestamp, prefix, values
+
+    def __iter__(self):
+        """Yields the merged session as NumPy chunks."""
+        streams = [self.read_stream(prefix) for prefix in self.segments]
+        width = 1 + len(self.columns)
+        chunk = np.full((self.chunk_size, width), np.nan)
+        count = 0
+        for timestamp, prefix, values in heapq.merge(*streams, key=lambda row: row[0]):
+            offset = self.offsets[prefix]
+            chunk[count, 0] = timestamp
+            chunk[count, offset:offset + len(values)] = values
+            count += 1
+            if count == self.chunk_size:
+                yield chunk
+                chunk = np.full((self.chunk_size, width), np.nan)
+                count = 0
+        if count:
+            yield chunk[:count]
@@ -0,0 +1,340 @@
+"""UDP soak test for the OSC ingest path.
+
+Runs one or more synthetic Muse-style senders over localhost against the real
+``start_osc_server`` / ``osc_handler`` path from ``main.py`` and reports loss,
+reordering, latency and CPU usage per process. EEG sequence numbers are checked
+against the chart buffers, and band records against the metrics CSV written by
+``MetricsCalculator``.
+
+The run happens in a fresh temporary directory so its ``logs/`` files never
+mix with, or split, a real recording session.
+
+Each ``/muse/eeg`` message carries its own bookkeeping in the first channels:
+
+- channel 0: per-sender sequence number
+- channel 1: sender id
+- channel 2: send time in milliseconds since the start of the run
+
+The remaining channels carry a synthetic EEG signal. OSC floats are 32-bit, so
+sequence numbers stay exact up to 2**24 messages per sender.
+
+Usage:
+    python src/soak.py --senders 4 --rate 256 --channels 6 --duration 30
+"""
+import argparse
+import glob
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from pythonosc import udp_client
+
+SEQ_CHANNEL = 0
+SENDER_CHANNEL = 1
+SENT_AT_CHANNEL = 2
+MIN_CHANNELS = 3
+BAND_ADDRESSES = [
+    "/muse/elements/delta_absolute",
+    "/muse/elements/theta_absolute",
+    "/muse/elements/alpha_absolute",
+    "/muse/elements/beta_absolute",
+    "/muse/elements/gamma_absolute",
+]
+
+
+def run_sender(sender_id, host, port, rate, channels, duration, epoch, band_rate, results):
+    """Sends synthetic Muse messages at a fixed rate and reports what was sent.
+
+    Args:
+        sender_id (int): Identifier embedded in every EEG message
+        host (str): Destination host
+        port (int): Destination UDP port
+        rate (float): EEG messages per second
+        channels (int): Number of values per EEG message
+        duration (float): How long to send for, in seconds
+        epoch (float): Shared wall-clock start time used for latency stamps
+        band_rate (float): Band records per second, 0 to disable
+        results (Queue): Queue receiving the sender summary dict
+    """
+    client = udp_client.SimpleUDPClient(host, port)
+    interval = 1.0 / rate
+    band_every = max(1, int(round(rate / band_rate))) if band_rate > 0 else 0
+    sent = 0
+    band_records = 0
+
+    start = time.perf_counter()
+    next_send = start
+    end = start + duration
+    while next_send < end:
+        now = time.perf_counter()
+        if now < next_send:
+            time.sleep(next_send - now)
+
+        values = [0.0] * channels
+        values[SEQ_CHANNEL] = float(sent)
+        values[SENDER_CHANNEL] = float(sender_id)
+        values[SENT_AT_CHANNEL] = (time.time() - epoch) * 1000.0
+        for i in range(MIN_CHANNELS, channels):
+            values[i] = 800.0 + 50.0 * math.sin(2 * math.pi * 10 * sent / rate + i)
+        client.send_message("/muse/eeg", values)
+        sent += 1
+
+        if band_every and sent % band_every == 0:
+            # Integer marker followed by one float per band, as ChanelProcessor expects
+            client.send_message("/muse/elements/blink", 1)
+            for i, address in enumerate(BAND_ADDRESSES):
+                client.send_message(address, 0.25 + 0.1 * i)
+            band_records += 1
+
+        next_send += interval
+
+    wall = time.perf_counter() - start
+    results.put({
+        "sender_id": sender_id,
+        "port": port,
+        "sent": sent,
+        "band_records": band_records,
+        "wall": wall,
+        "cpu": time.process_time(),
+    })
+
+
+def collect_samples(buffered_eeg_data):
+    """Rebuilds (seq, sender, sent_at, received_at) tuples from the chart buffer.
+
+    ``buffer_eeg_data`` stores one ``(timestamp, value)`` list per channel and
+    uses the same timestamp for every channel of a message, so the bookkeeping
+    channels are joined back together on that timestamp.
+
+    Args:
+        buffered_eeg_data (dict): The ``main.buffered_eeg_data`` buffer
+
+    Returns:
+        list: Samples in the order they were appended to the chart buffer
+    """
+    groups = {}
+    for channel in (SENDER_CHANNEL, SENT_AT_CHANNEL):
+        for timestamp, value in buffered_eeg_data.get(channel, []):
+            groups.setdefault((channel, timestamp), []).append(value)
+
+    samples = []
+    for timestamp, seq in buffered_eeg_data.get(SEQ_CHANNEL, []):
+        senders = groups.get((SENDER_CHANNEL, timestamp))
+        sent_ats = groups.get((SENT_AT_CHANNEL, timestamp))
+        if not senders or not sent_ats:
+            continue
+        received_at = datetime.fromisoformat(timestamp).timestamp()
+        samples.append((int(seq), int(senders.pop(0)), sent_ats.pop(0), received_at))
+    return samples
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(math.ceil(fraction * len(sorted_values))) - 1)
+    return sorted_values[max(0, index)]
+
+
+def summarize(sender_reports, samples, epoch):
+    """Computes loss, reordering and latency per sender.
+
+    Args:
+        sender_reports (list): Summary dicts returned by ``run_sender``
+        samples (list): Output of ``collect_samples``
+        epoch (float): Wall-clock start time of the run
+
+    Returns:
+        list: One dict per sender with the accounting results
+    """
+    per_sender = {report["sender_id"]: [] for report in sender_reports}
+    for seq, sender_id, sent_at, received_at in samples:
+        per_sender.setdefault(sender_id, []).append((seq, sent_at, received_at))
+
+    rows = []
+    for report in sender_reports:
+        received = per_sender.get(report["sender_id"], [])
+        seen = set()
+        duplicates = 0
+        reordered = 0
+        highest = -1
+        latencies = []
+        for seq, sent_at, received_at in received:
+            if seq in seen:
+                duplicates += 1
+                continue
+            seen.add(seq)
+            if seq < highest:
+                reordered += 1
+            highest = max(highest, seq)
+            latencies.append((received_at - epoch) * 1000.0 - sent_at)
+
+        latencies.sort()
+        lost = report["sent"] - len(seen)
+        rows.append({
+            "sender_id": report["sender_id"],
+            "port": report["port"],
+            "sent": report["sent"],
+            "received": len(seen),
+            "lost": lost,
+            "loss_pct": 100.0 * lost / report["sent"] if report["sent"] else 0.0,
+            "reordered": reordered,
+            "duplicates": duplicates,
+            "rate": report["sent"] / report["wall"] if report["wall"] else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else float("nan"),
+            "cpu_pct": 100.0 * report["cpu"] / report["wall"] if report["wall"] else 0.0,
+        })
+    return rows
+
+
+def expected_windows(record_timestamps, window_seconds):
+    """Replays MetricsCalculator's window rule over the completed band records.
+
+    Args:
+        record_timestamps (list): ISO timestamps of the completed band records
+        window_seconds (float): The calculator's window length
+
+    Returns:
+        int: Number of metrics rows the calculator should have written
+    """
+    count = 0
+    last = None
+    for timestamp in record_timestamps:
+        now = datetime.fromisoformat(timestamp)
+        if last is None or (now - last).total_seconds() >= window_seconds:
+            count += 1
+            last = now
+    return count
+
+
+def count_logged_rows(pattern):
+    """Counts the data rows in every CSV segment matching ``pattern``."""
+    rows = 0
+    for path in glob.glob(pattern):
+        with open(path, newline='') as f:
+            rows += max(0, sum(1 for line in f if line.strip()) - 1)  # Minus header
+    return rows
+
+
+def print_report(rows, receiver_cpu_pct, logged):
+    """Prints the soak results as a plain-text table."""
+    header = f"{'sender':>6} {'port':>6} {'sent':>8} {'recv':>8} {'lost':>6} {'loss%':>7} {'reord':>6} {'dup':>5} {'rate/s':>8} {'p50ms':>8} {'p99ms':>8} {'maxms':>8} {'cpu%':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['sender_id']:>6} {r['port']:>6} {r['sent']:>8} {r['received']:>8} {r['lost']:>6} "
+            f"{r['loss_pct']:>7.2f} {r['reordered']:>6} {r['duplicates']:>5} {r['rate']:>8.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f} {r['cpu_pct']:>6.1f}"
+        )
+    sent = sum(r["sent"] for r in rows)
+    lost = sum(r["lost"] for r in rows)
+    print("-" * len(header))
+    print(f"total sent: {sent}, lost: {lost} ({100.0 * lost / sent if sent else 0.0:.2f}%)")
+    print(f"receiver cpu: {receiver_cpu_pct:.1f}%")
+    if logged["band_sent"]:
+        print(
+            f"band records sent: {logged['band_sent']}, completed: {logged['band_received']} "
+            f"({logged['band_loss_pct']:.2f}% lost)"
+        )
+        print(f"metric windows expected: {logged['windows_expected']}, written to CSV: {logged['windows_logged']}")
+
+
+def run_soak(args):
+    """Starts the real OSC servers, runs the senders and reports the results.
+
+    Returns:
+        int: Process exit code, non-zero if EEG or band loss exceeded
+            ``--max-loss`` or the metrics CSV does not hold the expected windows
+    """
+    # Keep the run's logs/ out of the real session directory
+    workdir = tempfile.mkdtemp(prefix="teddy_soak_")
+    os.chdir(workdir)
+
+    # Imported here so spawned sender processes do not load the UI module
+    import main as app
+
+    ports = [args.base_port + i for i in range(args.senders)]
+    for port in ports:
+        app.start_osc_server(port)
+
+    results = multiprocessing.Queue()
+    epoch = time.time()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    senders = [
+        multiprocessing.Process(
+            target=run_sender,
+            args=(i, args.host, port, args.rate, args.channels, args.duration, epoch, args.band_rate, results),
+            daemon=True,
+        )
+        for i, port in enumerate(ports)
+    ]
+    for sender in senders:
+        sender.start()
+    sender_reports = [results.get() for _ in senders]
+    for sender in senders:
+        sender.join()
+
+    # Give the server threads time to drain the socket buffers
+    time.sleep(args.settle)
+    receiver_cpu_pct = 100.0 * (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+    for port in ports:
+        app.stop_osc_server(port)
+    app.metricsCalculator.writer.flush()
+
+    rows = summarize(sorted(sender_reports, key=lambda r: r["sender_id"]), collect_samples(app.buffered_eeg_data), epoch)
+    band_sent = sum(r["band_records"] for r in sender_reports)
+    band_received = len(app.buffered_channel_data[0])
+    logged = {
+        "band_sent": band_sent,
+        "band_received": band_received,
+        "band_loss_pct": 100.0 * max(0, band_sent - band_received) / band_sent if band_sent else 0.0,
+        "windows_expected": expected_windows(
+            [timestamp for timestamp, _ in app.buffered_channel_data[0]],
+            app.metricsCalculator.window_seconds,
+        ),
+        "windows_logged": count_logged_rows(os.path.join("logs", "metrics_*.csv")),
+    }
+    print_report(rows, receiver_cpu_pct, logged)
+    print(f"logs written to: {workdir}")
+
+    sent = sum(r["sent"] for r in rows)
+    lost = sum(r["lost"] for r in rows)
+    if logged["windows_logged"] != logged["windows_expected"]:
+        return 1
+    if args.max_loss is not None:
+        if sent and 100.0 * lost / sent > args.max_loss:
+            return 1
+        if logged["band_loss_pct"] > args.max_loss:
+            return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test the OSC ingest path with synthetic Muse senders.")
+    parser.add_argument("--senders", type=int, default=1, help="number of synthetic devices, one port each")
+    parser.add_argument("--rate", type=float, default=256.0, help="EEG messages per second per sender")
+    parser.add_argument("--channels", type=int, default=6, help=f"values per EEG message (min {MIN_CHANNELS})")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to send for")
+    parser.add_argument("--band-rate", type=float, default=10.0, help="band records per second per sender, 0 to disable")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=9100, help="first port, senders use consecutive ports")
+    parser.add_argument("--settle", type=float, default=1.0, help="seconds to wait for in-flight packets")
+    parser.add_argument("--max-loss", type=float, default=None, help="exit non-zero if loss percentage exceeds this")
+    args = parser.parse_args(argv)
+    if args.channels < MIN_CHANNELS:
+        parser.error(f"--channels must be at least {MIN_CHANNELS}")
+    if args.senders < 1 or args.rate <= 0:
+        parser.error("--senders and --rate must be positive")
+    return args
+
+
+if __name__ == "__main__":
+    raise SystemExit(run_soak(parse_args()))
@@ -0,0 +1,225 @@
+import math
+import random
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+class RunningStats:
+    """Constant-memory mean and variance using Welford's online algorithm.
+
+    Attributes:
+        count (int): Number of values seen
+        mean (float): Running mean
+        m2 (float): Sum of squared differences from the mean
+        min (float): Smallest value seen
+        max (float): Largest value seen
+    """
+
+    def __init__(self):
+        """Initializes an empty accumulator."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, value):
+        """Adds a value to the running statistics.
+
+        Args:
+            value (float): The new observation
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def variance(self):
+        """Returns the sample variance, or None with fewer than two values."""
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    def std(self):
+        """Returns the sample standard deviation, or None with fewer than two values."""
+        variance = self.variance()
+        return math.sqrt(variance) if variance is not None else None
+
+    def zscore(self, value):
+        """Standardizes a value against the running mean and standard deviation.
+
+        Args:
+            value (float): The value to standardize
+
+        Returns:
+            float or None: The z-score, or None if the deviation is not yet defined
+        """
+        std = self.std()
+        if not std:
+            return None
+        return (value - self.mean) / std
+
+
+class QuantileSketch:
+    """Constant-memory quantile estimates using a KLL sketch.
+
+    Values are kept in a stack of compactors. When the sketch is full, the
+    first full compactor is sorted and every other item is promoted to the
+    next level, doubling its weight. Memory stays around ``3 * k`` items
+    regardless of how many values are added.
+
+    Attributes:
+        k (int): Accuracy parameter, larger values trade memory for accuracy
+        count (int): Number of values seen
+        compactors (list): One list of retained items per level
+    """
+
+    def __init__(self, k=200, seed=None):
+        """Initializes an empty sketch.
+
+        Args:
+            k (int, optional): Capacity of the top compactor. Defaults to 200.
+            seed (int, optional): Seed for the compaction coin flips
+        """
+        self.k = k
+        self.count = 0
+        self.compactors = [[]]
+        self.size = 0
+        self.random = random.Random(seed)
+
+    def capacity(self, level):
+        """Returns how many items a compactor may hold before it is compacted."""
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, value):
+        """Adds a value to the sketch.
+
+        Args:
+            value (float): The new observation
+        """
+        self.compactors[0].append(value)
+        self.count += 1
+        self.size += 1
+        if self.size >= sum(self.capacity(h) for h in range(len(self.compactors))):
+            self.compress()
+
+    def compress(self):
+        """Compacts the lowest full level into the level above it."""
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) >= self.capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self.compactors.append([])
+                items = sorted(self.compactors[level])
+                # An odd item out stays behind so the promoted weight is exact
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self.random.randint(0, 1)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = keep
+                self.size = sum(len(c) for c in self.compactors)
+                return
+
+    def quantiles(self, qs):
+        """Estimates several quantiles from a single sort of the retained items.
+
+        Args:
+            qs (list): Quantiles between 0 and 1, in any order
+
+        Returns:
+            list: The estimated value for each quantile, None if the sketch is empty
+        """
+        weighted = sorted(
+            (value, 2 ** level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        if not weighted:
+            return [None] * len(qs)
+        total = sum(weight for _, weight in weighted)
+        results = {}
+        cumulative = 0
+        index = 0
+        for q in sorted(qs):
+            target = q * total
+            while index < len(weighted) - 1 and cumulative + weighted[index][1] < target:
+                cumulative += weighted[index][1]
+                index += 1
+            results[q] = weighted[index][0]
+        return [results[q] for q in qs]
+
+    def quantile(self, q):
+        """Estimates the value at quantile ``q``.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float or None: The estimated value, or None if the sketch is empty
+        """
+        return self.quantiles([q])[0]
+
+    def copy(self):
+        """Returns an independent copy of the retained items for offline queries."""
+        clone = QuantileSketch(k=self.k)
+        clone.count = self.count
+        clone.compactors = [list(items) for items in self.compactors]
+        clone.size = self.size
+        return clone
+
+
+class StreamStats:
+    """Running moments and quantiles for a single stream of values.
+
+    Usage:
+    1. Create instance: stats = StreamStats()
+    2. Feed data: stats.update(value)
+    3. Read results: stats.zscore(value) or stats.summary()
+    """
+
+    def __init__(self, k=200):
+        """Initializes empty moment and quantile accumulators.
+
+        Args:
+            k (int, optional): Accuracy parameter of the quantile sketch
+        """
+        self.moments = RunningStats()
+        self.sketch = QuantileSketch(k=k)
+
+    def update(self, value):
+        """Adds a value to both accumulators, ignoring None and NaN."""
+        if value is None or value != value:
+            return
+        self.moments.update(value)
+        self.sketch.update(value)
+
+    def zscore(self, value):
+        """Standardizes a value against everything seen so far."""
+        return self.moments.zscore(value)
+
+    def copy(self):
+        """Returns a snapshot that can be summarized without holding any lock."""
+        clone = StreamStats(k=self.sketch.k)
+        clone.moments.__dict__.update(self.moments.__dict__)
+        clone.sketch = self.sketch.copy()
+        return clone
+
+    def summary(self):
+        """Returns a JSON-serializable summary of the stream.
+
+        Returns:
+            dict: count, mean, variance, std, min, max and the QUANTILES
+        """
+        return {
+            "count": self.moments.count,
+            "mean": self.moments.mean if self.moments.count else None,
+            "variance": self.moments.variance(),
+            "std": self.moments.std(),
+            "min": self.moments.min,
+            "max": self.moments.max,
+            "quantiles": {
+                f"p{int(q * 100):02d}": value
+                for q, value in zip(QUANTILES, self.sketch.quantiles(QUANTILES))
+            },
+        }